@@ -1,6 +1,6 @@
-import csv
 import sys
-from collections import defaultdict
+
+import polars as pl
 
 
 def main():
@@ -8,26 +8,28 @@ def main():
         print("Usage: python3 find_duplicates.py <csv_filepath>")
         sys.exit(1)
     filepath = sys.argv[1]
-    # Dictionary to collect divisions for each athlete (using Name and Sex as identifier)
-    athletes_divisions = defaultdict(set)
-
-    # Open CSV file with UTF-8 encoding and skip comment lines (starting with //)
-    with open(filepath, encoding='utf-8-sig') as csvfile:
-        lines = [line for line in csvfile if not line.lstrip().startswith('//')]
-        reader = csv.DictReader(lines)
-        for row in reader:
-            name = row.get("Name", "").strip()
-            sex = row.get("Sex", "").strip()
-            division = row.get("Division", "").strip()
-            if name and sex and division:
-                key = (name, sex)
-                athletes_divisions[key].add(division)
-
-    # Filter athletes that appear in more than one division
-    duplicates = {key: sorted(
-        divisions) for key, divisions in athletes_divisions.items() if len(divisions) > 1}
-
-    if not duplicates:
+
+    # Read only the identifying columns, skipping comment lines (starting with //).
+    # A column missing from the file is treated as empty, so no athlete matches.
+    lf = pl.scan_csv(filepath, comment_prefix="//", infer_schema=False)
+    present = set(lf.collect_schema().names())
+    df = lf.select(
+        pl.col(column) if column in present else pl.lit("").alias(column)
+        for column in ["Name", "Sex", "Division"]
+    ).collect()
+    df = df.with_columns(pl.all().str.strip_chars()).filter(
+        pl.all_horizontal(pl.all().str.len_chars() > 0))
+
+    # Collect divisions for each athlete (using Name and Sex as identifier) and
+    # keep only athletes that appear in more than one division
+    duplicates = (
+        df.group_by(["Name", "Sex"])
+        .agg(divs=pl.col("Division").unique().sort())
+        .filter(pl.col("divs").list.len() > 1)
+        .sort(["Name", "Sex"])
+    )
+
+    if duplicates.is_empty():
         print("No athletes found in multiple divisions.")
         return
 
@@ -35,7 +37,7 @@ def main():
     header = "{:<25} {:<10} {}".format("Name", "Sex", "Divisions")
     print(header)
     print("-" * len(header))
-    for (name, sex), divisions in sorted(duplicates.items()):
+    for name, sex, divisions in duplicates.iter_rows():
         divisions_str = ", ".join(divisions)
         print("{:<25} {:<10} {}".format(name, sex, divisions_str))
 
@@ -12,12 +12,12 @@ You can override these defaults with command-line parameters if your file uses d
 or if you need to specify a different encoding or delimiter.
 
 Usage example:
-    python top3_openlifter.py "протокол 2 жени-ветерани .csv" --age_col "AgeCategory" --weight_col "WeightCategory" --score_col "Total" --encoding "utf-8" --sep ","
+    python top3_openlifter.py "протокол 2 жени-ветерани .csv" --age_col "AgeCategory" --weight_col "WeightCategory" --score_col "Total" --encoding "utf-8" --sep "," --output "top3_results.csv"
     
 If your file uses a different encoding (e.g., cp1251) or delimiter (e.g., semicolon), adjust the parameters accordingly.
 """
 
-import pandas as pd
+import polars as pl
 import sys
 import argparse
 
@@ -39,47 +39,71 @@ def main():
                         help='Encoding used to read the CSV file (default: utf-8)')
     parser.add_argument('--sep', default=',',
                         help='Delimiter used in the CSV file (default: ",")')
+    parser.add_argument('--output', default=None,
+                        help='Optional path of a CSV file to save the top 3 results to')
 
     args = parser.parse_args()
 
     print(args)
 
-    # Try reading the CSV file. If there is an error (e.g. wrong encoding or delimiter), it will raise an exception.
+    # Lazily scan the CSV file. Polars only supports UTF-8 when scanning, so other
+    # encodings are decoded eagerly first. Any error (e.g. wrong encoding or delimiter)
+    # surfaces when the schema is resolved.
     try:
-        df = pd.read_csv(args.csv_file, encoding=args.encoding, sep=args.sep)
+        if args.encoding.lower().replace('-', '') in ('utf8', 'utf8sig'):
+            lf = pl.scan_csv(args.csv_file, separator=args.sep)
+        else:
+            lf = pl.read_csv(args.csv_file, separator=args.sep,
+                             encoding=args.encoding).lazy()
+        schema = lf.collect_schema()
+        columns = schema.names()
     except Exception as e:
         print(f"Error reading CSV file {args.csv_file}: {e}")
         sys.exit(1)
 
     # Print out the column names detected in the CSV file. This helps verify your file structure.
     print("Columns detected in the CSV file:")
-    print(df.columns.tolist())
+    print(columns)
 
     # Check that the CSV file contains the required columns.
     required_columns = [args.age_col, args.weight_col, args.score_col]
-    missing_cols = [col for col in required_columns if col not in df.columns]
+    missing_cols = [col for col in required_columns if col not in columns]
     if missing_cols:
         print(
             f"Missing required columns in CSV file: {missing_cols}. Please verify the column names or adjust the parameters.")
         sys.exit(1)
 
-    # Group by age and weight category.
-    grouped = df.groupby([args.age_col, args.weight_col])
-
-    # Define a helper function that sorts each group by the score column in descending order
-    # (assuming higher score/best performance is better) and then selects the top 3.
-    def get_top3(group):
-        return group.sort_values(by=args.score_col, ascending=False).head(3)
-
-    # Apply the function to each group.
-    top3_df = grouped.apply(get_top3).reset_index(drop=True)
+    # Sort once by score in descending order (assuming higher score/best performance is better),
+    # then keep the first 3 rows of each age and weight category. Text category columns are
+    # grouped as categoricals (integer codes instead of hashed strings) but still listed in
+    # alphabetical order of their labels; numeric ones keep their type and numeric order.
+    # Score cells that are not numbers (e.g. "DQ") become null and sort last.
+    group_cols = [args.age_col, args.weight_col]
+    text_cols = [col for col in group_cols if schema[col] == pl.String]
+    q = (
+        lf.with_columns(pl.col(col).cast(pl.Categorical) for col in text_cols)
+        .with_columns(pl.col(args.score_col).cast(pl.Float64, strict=False))
+        .sort(args.score_col, descending=True, nulls_last=True, maintain_order=True)
+        .group_by(group_cols, maintain_order=True)
+        .head(3)
+        .sort([pl.col(col).cast(pl.String) if col in text_cols else pl.col(col)
+               for col in group_cols], maintain_order=True)
+        .select(columns)
+    )
+    try:
+        top3_df = q.collect(engine="streaming")
+    except Exception as e:
+        print(f"Error reading CSV file {args.csv_file}: {e}")
+        sys.exit(1)
 
     # Print the results.
     print("\nTop 3 athletes for each age and weight category:")
     print(top3_df)
 
-    # Optionally, if you want to save the output to a new CSV file, uncomment the line below:
-    # top3_df.to_csv("top3_results.csv", index=False)
+    # Optionally save the output to a new CSV file.
+    if args.output:
+        top3_df.write_csv(args.output)
+        print(f"\nSaved top 3 results to {args.output}")
 
 
 if __name__ == '__main__':
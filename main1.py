@@ -1,6 +1,6 @@
-import csv
 import sys
-from collections import defaultdict
+
+import polars as pl
 
 # Define the preferred division order. Divisions not in this dictionary will be assigned a high rank.
 division_order = {
@@ -13,80 +13,71 @@ division_order = {
 }
 
 
-def safe_float(value):
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0
-
-
 def main():
     if len(sys.argv) < 2:
         print("Usage: python3 main1.py <csv_filepath>")
         sys.exit(1)
     filepath = sys.argv[1]
-    groups = defaultdict(list)
 
-    # Open CSV file with UTF-8 encoding (sometimes a BOM is present)
-    with open(filepath, encoding='utf-8-sig') as csvfile:
-        # Remove any comments (lines starting with //) if present
-        lines = [line for line in csvfile if not line.lstrip().startswith('//')]
-        reader = csv.DictReader(lines)
+    # Scan the CSV keeping every value as text; comment lines (starting with //) are skipped.
+    # The query runs lazily, so the Place filter and the column selection are pushed down into
+    # the reader and only matching rows of the needed columns are materialized.
+    lf = pl.scan_csv(filepath, comment_prefix="//", infer_schema=False)
+    present = set(lf.collect_schema().names())
 
-        for row in reader:
-            # Skip row if "Place" is not a number (for example "NS")
-            if not row['Place'].strip().isdigit():
-                continue
-            # Create the key from Division, Sex and WeightClassKg
-            key = (
-                row['Division'].strip(),
-                row['Sex'].strip(),
-                row['WeightClassKg'].strip()
-            )
-            groups[key].append(row)
+    # Skip row if "Place" is not a number (for example "NS")
+    lf = lf.filter(
+        pl.col("Place").str.strip_chars().cast(pl.Int64, strict=False).is_not_null())
+    # Parse TotalKg and BodyweightKg once; values that are not numbers (or a missing column)
+    # count as 0
+    lf = lf.select(
+        pl.col("Division", "Sex", "WeightClassKg", "Name").str.strip_chars().fill_null(""),
+        *((pl.col(column) if column in present else pl.lit(None, dtype=pl.String).alias(column))
+          .str.strip_chars().cast(pl.Float64, strict=False).fill_null(0.0)
+          for column in ("TotalKg", "BodyweightKg")),
+    )
 
-    # Process each group: sort by TotalKg descending, then by BodyweightKg descending if equal
-    result = {}
-    for key, athletes in groups.items():
-        athletes.sort(key=lambda a: (safe_float(a.get('TotalKg')),
-                                     safe_float(a.get('BodyweightKg'))),
-                      reverse=True)
-        result[key] = athletes
+    # Sort once by division order, Sex and WeightClassKg, then by TotalKg descending, then by
+    # BodyweightKg descending if equal. Groups that tie on the first three keys (e.g. several
+    # divisions missing from division_order) are kept apart and in file order by the row where
+    # each group first appears.
+    lf = lf.with_row_index("row").with_columns(
+        div_rank=pl.col("Division").replace_strict(division_order, default=999),
+        group_first=pl.col("row").min().over(["Division", "Sex", "WeightClassKg"]),
+    )
+    lf = lf.sort(["div_rank", "Sex", "WeightClassKg", "group_first", "TotalKg", "BodyweightKg"],
+                 descending=[False, False, False, False, True, True], maintain_order=True)
 
     # Filter out duplicate competitors: if a person (by Name and Sex) appears in multiple groups,
-    # only keep him in the lowest division (lowest rank according to division_order)
-    unique_athletes = set()
-    unique_result = {}
-    # Sort groups by the division order, then by Sex and WeightClassKg for consistent ordering.
-    for key in sorted(result.keys(),
-                      key=lambda k: (division_order.get(k[0], 999), k[1], k[2])):
-        filtered = []
-        for athlete in result[key]:
-            identifier = (athlete['Name'].strip(), athlete['Sex'].strip())
-            if identifier not in unique_athletes:
-                filtered.append(athlete)
-                unique_athletes.add(identifier)
-        unique_result[key] = filtered
+    # only keep him in the lowest division (the first occurrence in the sorted frame)
+    lf = lf.unique(subset=["Name", "Sex"], keep="first", maintain_order=True)
+    df = lf.collect(engine="streaming")
+
+    # Split into one frame per (Division, Sex, WeightClassKg) group; the groups come out in the
+    # order of the sort above, i.e. by division order, then by Sex and WeightClassKg.
+    result = df.partition_by(["Division", "Sex", "WeightClassKg"],
+                             as_dict=True, maintain_order=True)
 
     # Pretty print output as tables for each group with more newlines between groups.
-    for (division, sex, weight_class), athletes in sorted(unique_result.items(),
-                                                          key=lambda k: (division_order.get(k[0][0], 999), k[0][1], k[0][2])):
-        # Only print non-empty groups
-        if not athletes:
-            continue
-        print("\n\n========================================")
-        print(
+    # Lines are collected and written to stdout in a single call.
+    header = f"{'Name':<25} {'TotalKg':>10} {'BodyweightKg':>15}"
+    sep_line = "-" * len(header)
+    out = []
+    for (division, sex, weight_class), athletes in result.items():
+        out.append("\n\n========================================")
+        out.append(
             f"Group: Division={division}, Sex={sex}, WeightClassKg={weight_class}")
-        print("========================================")
-        header = f"{'Name':<25} {'TotalKg':>10} {'BodyweightKg':>15}"
-        print(header)
-        print("-" * len(header))
-        for athlete in athletes:
-            total = safe_float(athlete.get('TotalKg'))
-            bodyweight = safe_float(athlete.get('BodyweightKg'))
-            name = athlete.get('Name')
-            print(f"{name:<25} {total:10.2f} {bodyweight:15.2f}")
-        print("\n")
+        out.append("========================================")
+        out.append(header)
+        out.append(sep_line)
+        for athlete in athletes.iter_rows(named=True):
+            total = athlete['TotalKg']
+            bodyweight = athlete['BodyweightKg']
+            name = athlete['Name']
+            out.append(f"{name:<25} {total:10.2f} {bodyweight:15.2f}")
+        out.append("\n")
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == '__main__':
@@ -1,9 +1,25 @@
 #!/usr/bin/env python3
 import sys
-import csv
+
+import polars as pl
 
 # Define the expected order of divisions.
 EXPECTED_DIVISIONS = ["Sub-Junior", "Junior", "M1", "M2", "M3", "Open"]
+_DIV_RANK = {division: rank for rank, division in enumerate(EXPECTED_DIVISIONS)}
+# Unexpected divisions get a rank lower (i.e. worse) than Open.
+_DEFAULT_RANK = len(EXPECTED_DIVISIONS)
+
+# Columns that are ranked numerically. Each is parsed once into a "<column>_num" Float64 column.
+NUMERIC_COLUMNS = ["Best3SquatKg", "Best3BenchKg",
+                   "Best3DeadliftKg", "TotalKg", "BodyweightKg"]
+
+# Separator lines and table layout used in the report.
+_BAR50 = "-" * 50
+_BAR70 = "=" * 70
+_TABLE_COLUMNS = ["Name", "Division", "Sex", "WeightClassKg", "BodyweightKg",
+                  "Best3SquatKg", "Best3BenchKg", "Best3DeadliftKg", "TotalKg"]
+_TABLE_FORMAT = "{:<20} {:<12} {:<8} {:<15} {:<12} {:<14} {:<14} {:<18} {:<10}"
+_TABLE_HEADER = _TABLE_FORMAT.format(*_TABLE_COLUMNS)
 
 
 def get_division_rank(division):
@@ -12,57 +28,50 @@ def get_division_rank(division):
     Lower numbers indicate a 'lower' division.
     Any division not in the expected list receives a rank lower than Open.
     """
-    if division in EXPECTED_DIVISIONS:
-        return EXPECTED_DIVISIONS.index(division)
-    else:
-        # unexpected divisions get a rank lower (i.e. worse)
-        return len(EXPECTED_DIVISIONS)
+    return _DIV_RANK.get(division, _DEFAULT_RANK)
 
 
-def parse_csv(filepath):
+def parse_csv(source):
     """
-    Reads the CSV and returns a dictionary of unique athletes (keyed by name).
+    Reads the CSV (a file path or a binary file-like object) and returns a DataFrame
+    of unique athletes (one row per name).
     For lifters appearing in multiple divisions, only the record in the lower (better)
     division (as determined by get_division_rank) is kept.
     Note: The "Place" column is completely ignored.
     """
-    athletes_by_name = {}
-
-    with open(filepath, newline='', encoding='utf-8-sig') as csvfile:
-        reader = csv.DictReader(csvfile)
-
-        for row in reader:
-            name = row.get("Name", "").strip()
-            if not name:
-                continue
-
-            division = row.get("Division", "").strip()
-            current_rank = get_division_rank(division)
-
-            # If athlete already exists, retain only the record from the lower ranked division.
-            if name in athletes_by_name:
-                existing_division = athletes_by_name[name].get(
-                    "Division", "").strip()
-                existing_rank = get_division_rank(existing_division)
-                if current_rank < existing_rank:
-                    athletes_by_name[name] = row
-            else:
-                athletes_by_name[name] = row
-    return athletes_by_name
-
-
-def group_athletes(athletes_by_name):
+    # Only the columns that are grouped on or printed are parsed; comment lines
+    # (starting with //) are skipped by the reader. Only Name is required: any other
+    # column missing from the file is treated as empty.
+    lf = pl.scan_csv(source, comment_prefix="//", infer_schema=False)
+    present = set(lf.collect_schema().names())
+    df = lf.select(
+        pl.col(column) if column in present or column == "Name" else pl.lit("").alias(column)
+        for column in ["Name", "Division", "Sex", "WeightClassKg", *NUMERIC_COLUMNS]
+    ).collect()
+    # Strip every value once so nothing downstream needs to.
+    df = df.with_columns(pl.all().fill_null("").str.strip_chars())
+    df = df.filter(pl.col("Name") != "").with_columns(
+        div_rank=pl.col("Division").replace_strict(_DIV_RANK, default=_DEFAULT_RANK))
+    # Parse the numeric columns once; values that are not numbers count as 0.
+    df = df.with_columns(
+        pl.col(column).cast(pl.Float64, strict=False)
+        .fill_null(0.0).alias(f"{column}_num")
+        for column in NUMERIC_COLUMNS)
+
+    # If an athlete appears more than once, retain only the record from the lower ranked division,
+    # kept at the position where the athlete first appears in the file.
+    df = df.with_row_index("first_row").with_columns(
+        pl.col("first_row").min().over("Name"))
+    return df.sort("div_rank", maintain_order=True).unique(
+        "Name", keep="first").sort("first_row").drop("first_row")
+
+
+def group_athletes(athletes):
     """
     Group athletes by (Sex, WeightClassKg, Division).
     """
-    groups = {}
-    for athlete in athletes_by_name.values():
-        sex = athlete.get("Sex", "").strip()
-        weightclass = athlete.get("WeightClassKg", "").strip()
-        division = athlete.get("Division", "").strip()
-        key = (sex, weightclass, division)
-        groups.setdefault(key, []).append(athlete)
-    return groups
+    return athletes.partition_by(["Sex", "WeightClassKg", "Division"],
+                                 as_dict=True, maintain_order=True)
 
 
 def group_sort_key(key):
@@ -80,68 +89,42 @@ def group_sort_key(key):
     return (sex.lower(), str(weight), get_division_rank(division))
 
 
-def print_group_metric_table(group_key, athletes, metric, metric_label):
+def format_group_metric_table(group_key, athletes, metric, metric_label):
     """
     For the given group and metric:
       - Sort athletes by the chosen metric descending and by BodyweightKg ascending (lighter lifter wins on tie).
       - Select the top 3 athletes.
-      - Print a header and the table.
+      - Return a header and the table as a string.
     """
     sex, weightclass, division = group_key
 
-    # Sorting key: primary is the metric (descending) and secondary is BodyweightKg (ascending).
-    def sort_key(athlete):
-        try:
-            metric_val = float(athlete.get(metric, 0))
-        except ValueError:
-            metric_val = 0.0
-        try:
-            bodyweight = float(athlete.get("BodyweightKg", 0))
-        except ValueError:
-            bodyweight = 0.0
-        return (-metric_val, bodyweight)
-
-    sorted_athletes = sorted(athletes, key=sort_key)
-    top_athletes = sorted_athletes[:3]
-
-    # Print header for this table.
-    print("-" * 50)
-    print(f"Top 3 {sex} {weightclass} {division} {metric_label.upper()}")
-    print("-" * 50)
-
-    # Define table header.
-    header = ["Name", "Division", "Sex", "WeightClassKg", "BodyweightKg",
-              "Best3SquatKg", "Best3BenchKg", "Best3DeadliftKg", "TotalKg"]
-    header_format = "{:<20} {:<12} {:<8} {:<15} {:<12} {:<14} {:<14} {:<18} {:<10}"
-    print(header_format.format(*header))
-
-    for athlete in top_athletes:
-        print(header_format.format(
-            athlete.get("Name", "").strip(),
-            athlete.get("Division", "").strip(),
-            athlete.get("Sex", "").strip(),
-            athlete.get("WeightClassKg", "").strip(),
-            athlete.get("BodyweightKg", "").strip(),
-            athlete.get("Best3SquatKg", "").strip(),
-            athlete.get("Best3BenchKg", "").strip(),
-            athlete.get("Best3DeadliftKg", "").strip(),
-            athlete.get("TotalKg", "").strip()
-        ))
+    # Sort by the metric (descending) and then by BodyweightKg (ascending).
+    top_athletes = athletes.sort([f"{metric}_num", "BodyweightKg_num"],
+                                 descending=[True, False], maintain_order=True).head(3)
 
+    # Header for this table.
+    lines = [
+        _BAR50,
+        f"Top 3 {sex} {weightclass} {division} {metric_label.upper()}",
+        _BAR50,
+        _TABLE_HEADER,
+    ]
 
-def main():
-    # Ensure the CSV filepath is provided as a command-line argument.
-    if len(sys.argv) < 2:
-        print("Usage: python separate_athletes.py <csv_filepath>")
-        sys.exit(1)
+    for row in top_athletes.select(_TABLE_COLUMNS).iter_rows():
+        lines.append(_TABLE_FORMAT.format(*row))
+    return "\n".join(lines)
 
-    filepath = sys.argv[1]
 
+def build_report(source):
+    """
+    Return the top 3 tables of every category for the CSV in source
+    (a file path or a binary file-like object) as a single string.
+    """
     # Parse CSV and deduplicate athletes.
-    athletes_by_name = parse_csv(filepath)
+    athletes = parse_csv(source)
 
     # Group athletes by (Sex, WeightClassKg, Division).
-    groups = group_athletes(athletes_by_name)
+    groups = group_athletes(athletes)
 
     # Sort group keys for predictable order.
     sorted_group_keys = sorted(groups.keys(), key=group_sort_key)
@@ -155,16 +138,36 @@ def main():
         ("TotalKg", "total")
     ]
 
-    # For each group, print the top 3 for each metric.
+    # For each group, add the top 3 for each metric.
+    out = []
     for group_key in sorted_group_keys:
         athletes = groups[group_key]
-        # Print a separator between different groups.
-        print("=" * 70)
-        print(f"Category: {group_key[0]} {group_key[1]} {group_key[2]}")
-        print("=" * 70)
+        # Add a separator between different groups.
+        out.append(_BAR70)
+        out.append(f"Category: {group_key[0]} {group_key[1]} {group_key[2]}")
+        out.append(_BAR70)
 
         for metric, metric_label in metrics:
-            print_group_metric_table(group_key, athletes, metric, metric_label)
+            out.append(format_group_metric_table(
+                group_key, athletes, metric, metric_label))
+    return "".join(line + "\n" for line in out)
+
+
+def run(source):
+    """
+    Print the top 3 tables of every category for the CSV in source
+    (a file path or a binary file-like object).
+    """
+    sys.stdout.write(build_report(source))
+
+
+def main():
+    # Ensure the CSV filepath is provided as a command-line argument.
+    if len(sys.argv) < 2:
+        print("Usage: python separate_athletes.py <csv_filepath>")
+        sys.exit(1)
+
+    run(sys.argv[1])
 
 
 if __name__ == "__main__":
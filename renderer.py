@@ -1,17 +1,12 @@
 from flask import Flask, request, render_template, redirect, flash
-import os
-import subprocess
-from werkzeug.utils import secure_filename
+import io
+
+import main2
 
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = 'uploads'
 app.secret_key = "your_secret_key"  # Replace with a secure key in production
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # limit file size to 16 MB
 
-# Create uploads directory if it doesn't exist
-if not os.path.exists(app.config['UPLOAD_FOLDER']):
-    os.makedirs(app.config['UPLOAD_FOLDER'])
-
 
 @app.route('/', methods=['GET', 'POST'])
 def upload_file():
@@ -30,28 +25,22 @@ def upload_file():
             return redirect(request.url)
 
         if file:
-            # Sanitize the filename and save it to the upload folder
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
+            # Keep the upload in memory; it never needs to touch the disk
+            upload = io.BytesIO()
+            file.save(upload)
+            upload.seek(0)
 
-            # Call your external Python script (main2.py) passing the file path as an argument
+            # Build main2's report in-process and use it as the output
             try:
-                # Using subprocess.run to execute main2.py
-                result = subprocess.run(
-                    ["python", "main2.py", filepath],
-                    capture_output=True, text=True, check=True
-                )
-                output = result.stdout
+                output = main2.build_report(upload)
                 print("out", output)
-            except subprocess.CalledProcessError as e:
-                output = f"An error occurred while processing the file: {e.stderr}"
-            if os.path.exists(filepath):
-                os.remove(filepath)
+            except Exception as e:
+                output = f"An error occurred while processing the file: {e}"
 
     # Render the template with the output result
     return render_template('index.html', output=output)
 
 
+# Development server only; in production serve wsgi:app with gunicorn (see wsgi.py).
 if __name__ == '__main__':
     app.run(port=4888)
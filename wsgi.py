@@ -0,0 +1,11 @@
+"""
+WSGI entry point for serving the upload page with a production server, e.g.:
+
+    gunicorn -w 4 -k sync --timeout 120 -b 0.0.0.0:4888 wsgi:app
+
+Each worker is a separate process, so uploads are processed in parallel.
+"""
+
+from renderer import app
+
+__all__ = ["app"]